@@ -0,0 +1,76 @@
+"""
+Last-seen Chromecasts, so they can be checked again without mDNS discovery
+"""
+import json
+import socket
+from types import SimpleNamespace
+
+from .metadata_cache import CACHE_DIR
+
+KNOWN_DEVICES_PATH = CACHE_DIR.parent / "last_devices.json"
+
+_FIELDS = (
+    "friendly_name",
+    "manufacturer",
+    "model_name",
+    "cast_type",
+    "uuid",
+    "host",
+    "port",
+)
+
+
+def save_known_devices(cast_infos) -> None:
+    """
+    Remember discovered devices, given their pychromecast CastInfo.
+    """
+    devices = [
+        {field: getattr(info, field) for field in _FIELDS} for info in cast_infos
+    ]
+    try:
+        KNOWN_DEVICES_PATH.parent.mkdir(parents=True, exist_ok=True)
+        KNOWN_DEVICES_PATH.write_text(json.dumps(devices, default=str))
+    except OSError:
+        pass
+
+
+def load_known_devices() -> list[SimpleNamespace]:
+    """
+    Return the devices saved last time, with the same attributes as CastInfo.
+    """
+    try:
+        devices = json.loads(KNOWN_DEVICES_PATH.read_text())
+    except (OSError, ValueError):
+        return []
+    return [SimpleNamespace(**{f: d.get(f) for f in _FIELDS}) for d in devices]
+
+
+def probe_known_devices(
+    timeout: float = 0.25, limit: int | None = None
+) -> list[SimpleNamespace]:
+    """
+    Return the saved devices that are still reachable and still the same device,
+    stopping once `limit` have answered. Names and models are refreshed from the
+    device, since they may have changed since they were saved.
+    """
+    from pychromecast.dial import get_device_info
+
+    reachable = []
+    for device in load_known_devices():
+        try:
+            with socket.create_connection((device.host, device.port), timeout):
+                pass
+        except (OSError, TypeError):
+            continue
+        # DHCP may have handed the address to another device since
+        status = get_device_info(device.host, timeout=1)
+        if status is None or str(status.uuid) != device.uuid:
+            continue
+        device.friendly_name = status.friendly_name
+        device.manufacturer = status.manufacturer
+        device.model_name = status.model_name
+        device.cast_type = status.cast_type
+        reachable.append(device)
+        if limit and len(reachable) >= limit:
+            break
+    return reachable
@@ -1,7 +1,9 @@
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class Device:
     manufacturer: str
     model_name: str
@@ -9,7 +11,7 @@ class Device:
     ac3: bool
 
 
-_devices = {
+_DEVICES: tuple[Device, ...] = (
     # Google Chromecast devices
     Device(
         manufacturer="Unknown manufacturer",
@@ -100,16 +102,28 @@ _devices = {
         h265=True,
         ac3=True,
     ),
+)
+
+_DEFAULT = Device(
+    manufacturer="Unknown manufacturer", model_name="Default", h265=False, ac3=False
+)
+
+
+def _intern(s: str | None) -> str | None:
+    # Interned keys let tuple comparison short-circuit on identity.
+    return sys.intern(s) if isinstance(s, str) else s
+
+
+# The table is static, so the key -> Device map is built once at import.
+_BY_KEY: dict[tuple[str, str], Device] = {
+    (_intern(d.manufacturer), _intern(d.model_name)): d for d in _DEVICES
 }
+assert len(_BY_KEY) == len(_DEVICES), "duplicate (manufacturer, model_name) in _DEVICES"
 
 
+@lru_cache(maxsize=128)
 def get_device(manufacturer: str, model_name: str) -> Device:
     """
     Get a device by its manufacturer and model name.
     """
-    for device in _devices:
-        if device.manufacturer == manufacturer and device.model_name == model_name:
-            return device
-    return Device(
-        manufacturer="Unknown manufacturer", model_name="Default", h265=False, ac3=False
-    )
+    return _BY_KEY.get((_intern(manufacturer), _intern(model_name)), _DEFAULT)
@@ -1,50 +1,164 @@
+import json
 import os
+import shutil
 import subprocess
 import tempfile
+from functools import cache
 from pathlib import Path
 
 from .utils import get_tempfile_prefix
 
+try:
+    import av
+except ImportError:
+    av = None
 
-def parse_ffmpeg_time(time_s: str) -> float:
-    hours, minutes, seconds = (float(s) for s in time_s.split(":"))
-    return hours * 60 * 60 + minutes * 60 + seconds
 
+@cache
+def _which(program: str) -> str:
+    return shutil.which(program) or program
 
+
+def _run(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    # CPython only uses the posix_spawn fast path (instead of fork+exec) for
+    # an executable with a directory component and close_fds=False. Keep
+    # env/cwd/preexec_fn out of here or it silently falls back to fork.
+    # Python-created fds are non-inheritable, so close_fds=False leaks none.
+    return subprocess.run([_which(cmd[0]), *cmd[1:]], close_fds=False, **kwargs)
+
+
+@cache
 def check_ffmpeg_installed() -> bool:
     try:
-        subprocess.run(["ffmpeg", "-version"], check=True, stdout=subprocess.DEVNULL)
+        _run(["ffmpeg", "-version"], check=True, stdout=subprocess.DEVNULL)
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         return False
 
 
 def extract_thumbnail(file_path: Path, offset: int = 30) -> Path:
-    _, output_path = tempfile.mkstemp(
-        prefix=f"{get_tempfile_prefix()}_thumbnail_", suffix=".jpg"
-    )
+    return extract_thumbnails(file_path, [offset])[0]
+
+
+def extract_thumbnails(file_path: Path, offsets: list[int]) -> list[Path]:
+    """
+    Extract one thumbnail per offset using a single ffmpeg process.
+    """
+    if not offsets:
+        return []
+
+    path_str = os.fspath(file_path)
+    output_paths = []
+    for _ in offsets:
+        fd, output_path = tempfile.mkstemp(
+            prefix=f"{get_tempfile_prefix()}_thumbnail_", suffix=".jpg"
+        )
+        os.close(fd)  # ffmpeg reopens the file by path
+        output_paths.append(output_path)
     cmd = [
         "ffmpeg",
         "-y",
         *("-v", "0"),  # Set log level to quiet
-        *("-i", file_path),
-        *("-f", "mjpeg"),
-        *("-vframes", "1"),
-        *("-ss", str(offset)),
-        *("-vf", "scale=600:-1"),
-        output_path,
     ]
-    subprocess.run(cmd, check=True)
-    return Path(output_path)
+    # -ss before -i seeks via the container index instead of decoding up to
+    # the offset, so each offset gets its own input. One decode thread each
+    # keeps pool workers * threads close to the CPU count.
+    for offset in offsets:
+        cmd += [*("-threads", "1"), *("-ss", str(offset)), *("-i", path_str)]
+    for i, output_path in enumerate(output_paths):
+        cmd += [
+            *("-map", f"{i}:v:0"),
+            *("-f", "mjpeg"),
+            *("-vframes", "1"),
+            *("-vf", "scale=600:-1"),
+            output_path,
+        ]
+    _run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return [Path(output_path) for output_path in output_paths]
+
+
+def probe_media(file_path: Path) -> dict:
+    """
+    Return ffprobe's stream and format info, or an empty dict if unreadable.
+    """
+    if av is not None:
+        try:
+            return _probe_media_av(file_path)
+        except av.error.FFmpegError:
+            pass
+
+    cmd = [
+        "ffprobe",
+        "-hide_banner",
+        *("-threads", "1"),
+        *("-v", "error"),
+        "-show_streams",
+        "-show_format",
+        *("-of", "json"),
+        os.fspath(file_path),
+    ]
+    result = _run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        return json.loads(result.stdout)
+    except ValueError:
+        return {}
+
+
+def _probe_media_av(file_path: Path) -> dict:
+    # Same shape as ffprobe's JSON, read in-process through libav
+    with av.open(os.fspath(file_path)) as container:
+        streams = []
+        for stream in container.streams:
+            codec_context = stream.codec_context
+            info = {
+                "index": stream.index,
+                "codec_type": stream.type,
+                "codec_name": codec_context.name if codec_context else None,
+                "tags": dict(stream.metadata),
+            }
+            if stream.type == "audio":
+                info["channels"] = codec_context.channels
+            streams.append(info)
+        data = {"streams": streams, "format": {}}
+        if container.duration is not None:
+            data["format"]["duration"] = container.duration / av.time_base
+    return data
+
+
+# Durations keyed by (path, mtime_ns, size) so unchanged files skip the probe
+_duration_cache: dict[tuple[str, int, int], float] = {}
 
 
 def get_media_duration(file_path: Path) -> float:
+    st = os.stat(file_path)
+    key = (os.fspath(file_path), st.st_mtime_ns, st.st_size)
+    try:
+        return _duration_cache[key]
+    except KeyError:
+        pass
+    duration = _probe_media_duration(file_path)
+    _duration_cache[key] = duration
+    return duration
+
+
+def _probe_media_duration(file_path: Path) -> float:
+    if av is not None:
+        # Reading the container header in-process avoids spawning ffprobe
+        try:
+            with av.open(str(file_path)) as container:
+                if container.duration is not None:
+                    return container.duration / av.time_base
+        except av.error.FFmpegError:
+            pass
+
     cmd = [
         "ffprobe",
+        "-hide_banner",
+        *("-threads", "1"),
         *("-v", "error"),
         *("-show_entries", "format=duration"),
-        *("-of", "default=noprint_wrappers=1:nokey=1"),
+        *("-of", "csv=p=0"),
         str(file_path),
     ]
-    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-    return float(result.stdout.strip())
+    result = _run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return float(result.stdout)
@@ -0,0 +1,16 @@
+"""
+Shared worker pool for the short-lived ffmpeg/ffprobe helpers
+"""
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .ffmpeg import extract_thumbnail
+
+_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="qtcast_ffmpeg"
+)
+
+
+def submit_thumbnail(file_path: Path, offset: int = 30) -> Future:
+    return _executor.submit(extract_thumbnail, file_path, offset)
@@ -1,11 +1,14 @@
 """
 QtCast - Main application window and logic
 """
+import hashlib
 import os
-import subprocess
 import sys
 import threading
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from PyQt6.QtWidgets import (
@@ -15,10 +18,12 @@ from PyQt6.QtWidgets import (
     QHeaderView
 )
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QThread, QUrl
-from PyQt6.QtGui import QPixmap, QIcon, QDragEnterEvent, QDropEvent
+from PyQt6.QtGui import QPixmap, QPixmapCache, QIcon, QDragEnterEvent, QDropEvent
 
 try:
     import pychromecast
+    import zeroconf
+    from pychromecast.discovery import CastBrowser, SimpleCastListener
     DEPS_MET = True
 except ImportError:
     DEPS_MET = False
@@ -27,87 +32,97 @@ except ImportError:
 from .version import __version__
 from .webserver import QtCastWebServer
 from .transcoder import Transcoder, AUDIO_EXTS
-from .ffmpeg import (
-    check_ffmpeg_installed,
-    extract_thumbnail,
-    get_media_duration,
-)
+from .ffmpeg import check_ffmpeg_installed, get_media_duration, probe_media
+from .ffmpeg_pool import submit_thumbnail
+from .metadata_cache import load_metadata, store_metadata
 from .subtitles import convert_subtitles_to_webvtt, extract_subtitles_from_file
 from .screensaver import ScreenSaverInhibitor
-from .utils import humanize_seconds
+from .utils import humanize_seconds, start_thread
 
 import re
 
 
-def parse_tv_filename(filename):
-    """Parse TV show filename to extract metadata for Chromecast.
+# Tried in order, exactly like matching the patterns one after another:
+# TV with episode title, TV, movie with quality, "Movie Name (2024)"
+_FILENAME_PATTERN = re.compile(
+    r'^(?:'
+    r'(?P<tv_titled>(?P<tv_titled_series>.+?)[.\s]+S(?P<tv_titled_season>\d{1,2})'
+    r'E(?P<tv_titled_episode>\d{1,2})[.\s]+(?P<tv_titled_title>.+?)[.\s]+\d{3,4}p)'
+    r'|(?P<tv>(?P<tv_series>.+?)[.\s]+S(?P<tv_season>\d{1,2})E(?P<tv_episode>\d{1,2}))'
+    r'|(?P<movie_dotted>(?P<movie_dotted_title>.+?)[.\s]+(?P<movie_dotted_year>\d{4})'
+    r'[.\s]+\d{3,4}p)'
+    r'|(?P<movie>(?P<movie_title>.+?)\s*\((?P<movie_year>\d{4})\))'
+    r')',
+    re.IGNORECASE,
+)
+
+
+def classify_filename(filename):
+    """Parse a TV show or movie filename to extract metadata for Chromecast.
 
     Supports patterns like:
     - Show.Name.S01E02.Episode.Title.1080p.WEB-DL.mkv
     - Show Name - S01E02 - Episode Title.mkv
+    - Movie.Name.2024.1080p.BluRay.mkv
+    - Movie Name (2024).mkv
     """
-    basename = os.path.basename(filename)
-
-    # Pattern 1: Show.Name.S01E02.Episode.Title.Quality...
-    pattern1 = r'^(.+?)[.\s]+S(\d{1,2})E(\d{1,2})[.\s]+(.+?)[.\s]+\d{3,4}p'
-    match = re.match(pattern1, basename, re.IGNORECASE)
+    match = _FILENAME_PATTERN.match(os.path.basename(filename))
+    if not match:
+        return None
 
-    if match:
+    kind = match.lastgroup
+    if kind == "tv_titled":
         return {
             "metadataType": 2,  # TV Show
-            "seriesTitle": match.group(1).replace('.', ' ').strip(),
-            "season": int(match.group(2)),
-            "episode": int(match.group(3)),
-            "title": match.group(4).replace('.', ' ').strip(),
+            "seriesTitle": match["tv_titled_series"].replace('.', ' ').strip(),
+            "season": int(match["tv_titled_season"]),
+            "episode": int(match["tv_titled_episode"]),
+            "title": match["tv_titled_title"].replace('.', ' ').strip(),
         }
-
-    # Pattern 2: Show.Name.S01E02... (without episode title before quality)
-    pattern2 = r'^(.+?)[.\s]+S(\d{1,2})E(\d{1,2})'
-    match = re.match(pattern2, basename, re.IGNORECASE)
-
-    if match:
+    if kind == "tv":
         return {
             "metadataType": 2,  # TV Show
-            "seriesTitle": match.group(1).replace('.', ' ').strip(),
-            "season": int(match.group(2)),
-            "episode": int(match.group(3)),
+            "seriesTitle": match["tv_series"].replace('.', ' ').strip(),
+            "season": int(match["tv_season"]),
+            "episode": int(match["tv_episode"]),
         }
-
-    return None
-
-
-def parse_movie_filename(filename):
-    """Parse movie filename to extract metadata for Chromecast.
-
-    Supports patterns like:
-    - Movie.Name.2024.1080p.BluRay.mkv
-    - Movie Name (2024).mkv
-    """
-    basename = os.path.basename(filename)
-
-    # Pattern 1: Movie.Name.2024.Quality...
-    pattern1 = r'^(.+?)[.\s]+(\d{4})[.\s]+\d{3,4}p'
-    match = re.match(pattern1, basename, re.IGNORECASE)
-
-    if match:
+    if kind == "movie_dotted":
         return {
             "metadataType": 1,  # Movie
-            "title": match.group(1).replace('.', ' ').strip(),
-            "releaseDate": match.group(2),
+            "title": match["movie_dotted_title"].replace('.', ' ').strip(),
+            "releaseDate": match["movie_dotted_year"],
         }
-
-    # Pattern 2: Movie Name (2024)
-    pattern2 = r'^(.+?)\s*\((\d{4})\)'
-    match = re.match(pattern2, basename, re.IGNORECASE)
-
-    if match:
-        return {
-            "metadataType": 1,  # Movie
-            "title": match.group(1).strip(),
-            "releaseDate": match.group(2),
-        }
-
-    return None
+    return {
+        "metadataType": 1,  # Movie
+        "title": match["movie_title"].strip(),
+        "releaseDate": match["movie_year"],
+    }
+
+
+# Extensions picked up when a directory is dropped or passed on the command line
+MEDIA_EXTS = (".mp4", ".mkv", ".avi", ".mov", ".m4v", ".webm", ".mp3", ".aac", ".wav")
+
+
+def expand_media_paths(paths):
+    """Yield files as given and the media files directly inside directories"""
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as it:
+                # is_file() uses the directory entry type, no extra stat
+                entries = sorted(
+                    (e for e in it if e.is_file() and e.name.lower().endswith(MEDIA_EXTS)),
+                    key=lambda e: e.name,
+                )
+            for entry in entries:
+                yield entry.path
+        elif os.path.isfile(path):
+            yield path
+
+
+# Bounded so queueing many files doesn't start one probe per file at once
+_PARSE_POOL = ThreadPoolExecutor(
+    max_workers=max(2, min(8, os.cpu_count() or 4)), thread_name_prefix="qtcast_parse"
+)
 
 
 class StreamMetadata:
@@ -151,87 +166,74 @@ class FileMetadata:
     def __init__(self, fn, callback):
         self.fn = fn
         self.ready = False
+        self._ready_event = threading.Event()
         self.thumbnail_fn = None
-        self._ffmpeg_output = None
         self.container = None
+        self.duration = None
         self.video_streams = []
         self.audio_streams = []
         self.subtitles = []
+        self._subtitles_lock = threading.Lock()
+        self._subtitles_loaded = False
 
-        # Parse in a thread
-        threading.Thread(target=self._parse, args=(callback,), daemon=True).start()
+        # Parse on the shared pool
+        _PARSE_POOL.submit(self._parse, callback)
 
     def _parse(self, callback):
-        """Parse file metadata using ffmpeg"""
-        self.thumbnail_fn = str(extract_thumbnail(self.fn))
+        """Parse file metadata, releasing waiters even if parsing fails"""
         try:
-            self._ffmpeg_output = subprocess.check_output(
-                ["ffmpeg", "-i", self.fn, "-f", "ffmetadata", "-"],
-                stderr=subprocess.STDOUT,
-            ).decode()
-        except subprocess.CalledProcessError as e:
-            self._ffmpeg_output = e.output.decode() if e.output else ""
-
-        output = self._ffmpeg_output.split("\n")
-        self.container = self.fn.lower().split(".")[-1]
-        stream = None
-
-        for line in output:
-            line = line.strip()
-            if line.startswith("Stream") and "Video" in line:
-                id = line.split()[1].strip("#").strip(":")
-                title = "Video #%i" % (len(self.video_streams) + 1)
-                if "(" in id:
-                    title = id[id.index("(") + 1 : id.index(")")]
-                    id = id[: id.index("(")]
-                # Strip hex notation like [0x1] from stream id
-                if "[" in id:
-                    id = id[: id.index("[")]
-                video_codec = line.split()[3]
-                stream = StreamMetadata(id, video_codec, title)
-                self.video_streams.append(stream)
-            elif line.startswith("Stream") and "Audio" in line:
-                title = "Audio #%i" % (len(self.audio_streams) + 1)
-                id = line.split()[1].strip("#").strip(":")
-                if "(" in id:
-                    title = id[id.index("(") + 1 : id.index(")")]
-                    id = id[: id.index("(")]
-                # Strip hex notation like [0x2] from stream id
-                if "[" in id:
-                    id = id[: id.index("[")]
-                audio_codec = line.split()[3].strip(",")
-                stream = AudioMetadata(id, audio_codec, title=title)
-                if ", mono, " in line:
-                    stream.channels = 1
-                if ", stereo, " in line:
-                    stream.channels = 2
-                if ", 5.1" in line:
-                    stream.channels = 6
-                if ", 7.1" in line:
-                    stream.channels = 8
-                self.audio_streams.append(stream)
-            elif line.startswith("Stream") and "Subtitle" in line:
-                id = line.split()[1].strip("#").strip(":")
-                if "(" in id:
-                    title = id[id.index("(") + 1 : id.index(")")]
-                    id = id[: id.index("(")]
-                else:
-                    title = "Subtitle #%i" % (len(self.subtitles) + 1)
-                # Strip hex notation like [0x3] from stream id
-                if "[" in id:
-                    id = id[: id.index("[")]
-                stream = StreamMetadata(id, None, title)
-                self.subtitles.append(stream)
-            elif stream and line.startswith("title"):
-                parts = line.split()
-                if len(parts) >= 3:
-                    stream.title = parts[2]
-
-        self.load_subtitles()
-        self.ready = True
+            self._parse_streams()
+            self.ready = True
+        except Exception:
+            print("Failed to parse %s" % self.fn)
+            traceback.print_exc()
+        finally:
+            self._ready_event.set()
         print(self)
         if callback:
-            callback(self)
+            # The pool's Future is discarded, so report errors here
+            try:
+                callback(self)
+            except Exception:
+                print("Metadata callback failed for %s" % self.fn)
+                traceback.print_exc()
+
+    def _parse_streams(self):
+        """Parse file metadata using ffprobe"""
+        cached = load_metadata(self.fn)
+        if cached:
+            data, self.thumbnail_fn = cached
+        else:
+            thumbnail = submit_thumbnail(self.fn)
+            data = probe_media(self.fn)
+            self.thumbnail_fn = str(thumbnail.result())
+            if data:
+                self.thumbnail_fn = store_metadata(self.fn, data, self.thumbnail_fn)
+
+        self.container = self.fn.lower().split(".")[-1]
+        # The probe already knows the duration; saves a second ffprobe run
+        duration = data.get("format", {}).get("duration")
+        if duration is not None:
+            self.duration = float(duration)
+
+        for stream in data.get("streams", []):
+            codec_type = stream.get("codec_type")
+            id = "0:%i" % stream["index"]
+            tags = stream.get("tags", {})
+            title = tags.get("title") or tags.get("language")
+            if codec_type == "video":
+                title = title or "Video #%i" % (len(self.video_streams) + 1)
+                self.video_streams.append(
+                    StreamMetadata(id, stream.get("codec_name"), title)
+                )
+            elif codec_type == "audio":
+                title = title or "Audio #%i" % (len(self.audio_streams) + 1)
+                audio = AudioMetadata(id, stream.get("codec_name"), title=title)
+                audio.channels = stream.get("channels", 2)
+                self.audio_streams.append(audio)
+            elif codec_type == "subtitle":
+                title = title or "Subtitle #%i" % (len(self.subtitles) + 1)
+                self.subtitles.append(StreamMetadata(id, None, title))
 
     def __repr__(self):
         return (f"FileMetadata(fn:{self.fn}, ready:{self.ready}, "
@@ -249,26 +251,89 @@ class FileMetadata:
         else:
             self.subtitles = []
 
+    def ensure_subtitles_loaded(self):
+        """Extract embedded subtitles on first use"""
+        with self._subtitles_lock:
+            if not self._subtitles_loaded:
+                self.load_subtitles()
+                self._subtitles_loaded = True
+
     def wait(self):
         """Wait for parsing to complete"""
-        while not self.ready:
-            time.sleep(0.1)
+        self._ready_event.wait()
 
 
 class ChromecastDiscoveryThread(QThread):
     """Thread for discovering Chromecasts"""
     found = pyqtSignal(list)  # list of chromecasts
 
+    def __init__(self, timeout=3, max_devices=None):
+        super().__init__()
+        self.timeout = timeout
+        # Stop browsing as soon as this many devices have been found
+        self.max_devices = max_devices
+        self._cancelled = threading.Event()
+        self._wake = threading.Event()
+
+    def cancel(self):
+        """Stop browsing early and drop the results"""
+        self._cancelled.set()
+        self._wake.set()
+
     def run(self):
-        chromecasts, _ = pychromecast.get_chromecasts(timeout=10)
+        zconf = zeroconf.Zeroconf()
+
+        def on_added(uuid, service):
+            if self.max_devices and len(browser.devices) >= self.max_devices:
+                self._wake.set()
+
+        browser = CastBrowser(SimpleCastListener(add_callback=on_added), zconf)
+        browser.start_discovery()
+        self._wake.wait(self.timeout)
+        browser.stop_discovery()
+        if self._cancelled.is_set():
+            zconf.close()
+            return
+
+        # zconf stays open: the Chromecast objects use it to resolve hosts
+        chromecasts = [
+            pychromecast.get_chromecast_from_cast_info(cast_info, zconf)
+            for cast_info in browser.devices.values()
+        ]
         self.found.emit(chromecasts)
 
 
+class CastStatusListener:
+    """Forwards media status pushed by a Chromecast to the GUI thread"""
+
+    def __init__(self, cast, signal):
+        self.cast = cast
+        self.signal = signal
+
+    def new_media_status(self, status):
+        self.signal.emit(self.cast, status)
+
+    def load_media_failed(self, queue_item_id, error_code):
+        print(f"Chromecast failed to load media: {error_code}")
+
+
+# Interval in milliseconds for advancing the scrubber between status updates
+SCRUBBER_INTERVAL = 1000
+
+# Start transcoding the next queued file once the current one is this far
+# along, with at most this many ffmpeg transcodes running at once
+PRE_TRANSCODE_PERCENT = 50
+MAX_CONCURRENT_TRANSCODES = 2
+
+
 class QtCastWindow(QMainWindow):
     """Main application window"""
 
     # Signal for thread-safe UI updates from background threads
     file_ui_ready = pyqtSignal(int, object)  # index, fmd
+    media_status_changed = pyqtSignal(object, object)  # cast, media status
+    subtitles_loaded = pyqtSignal(object)  # subtitle combo item data
+    file_metadata_ready = pyqtSignal(object, object)  # fmd, duration
 
     def __init__(self):
         super().__init__()
@@ -284,7 +349,13 @@ class QtCastWindow(QMainWindow):
         self.cast = None
         self.webserver = None
         self.chromecasts = []
+        self.discovery_thread = None
         self.files_data = []  # List of (filename, fmd, transcoder, duration)
+        self._files_index = {}  # filename -> index into files_data
+        self._transcode_pct = {}  # filename -> last shown transcode percent
+        self._metadata_cache = {}  # filename -> classify_filename() result
+        self._media_info = {}  # filename -> (file_id, ext, mime), set when queued
+        self._file_by_id = {}  # file_id -> filename, for the webserver
         self.transcoder_lock = threading.Lock()  # Prevent race conditions
         self.current_file = None
         self.current_transcoder = None
@@ -303,14 +374,18 @@ class QtCastWindow(QMainWindow):
 
         # Connect signals for thread-safe operations
         self.file_ui_ready.connect(self._update_file_ui)
+        self.subtitles_loaded.connect(self._on_subtitles_loaded)
+        self.file_metadata_ready.connect(self._on_file_metadata_ready)
 
         # Start webserver in background
         threading.Thread(target=self.start_webserver, daemon=True).start()
 
-        # Start status monitoring
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.monitor_cast_status)
-        self.status_timer.start(1000)  # Check every second
+        # Cast status is pushed by pychromecast; the timer only moves the
+        # scrubber along while playing
+        self._status_listeners = {}  # cast -> CastStatusListener
+        self.media_status_changed.connect(self._on_media_status)
+        self.scrubber_timer = QTimer()
+        self.scrubber_timer.timeout.connect(self.update_scrubber)
 
         # Check ffmpeg
         threading.Thread(target=self.check_ffmpeg, daemon=True).start()
@@ -355,6 +430,7 @@ class QtCastWindow(QMainWindow):
         self.thumbnail_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.thumbnail_label.setMinimumHeight(200)
         self.thumbnail_label.setStyleSheet("QLabel { background-color: #2a2a2a; }")
+        QPixmapCache.setCacheLimit(50 * 1024)  # in KB
         main_layout.addWidget(self.thumbnail_label)
 
         # File list
@@ -444,19 +520,27 @@ class QtCastWindow(QMainWindow):
         """Start the HTTP server for streaming"""
         self.webserver = QtCastWebServer(
             get_subtitles=lambda: self.subtitles,
-            get_transcoder=lambda: self.current_transcoder,
+            get_transcoder=self.get_transcoder_by_id,
             get_thumbnail=lambda: self.get_current_thumbnail(),
         )
         print(f"serving on http://{self.webserver.ip}:{self.webserver.port}")
         self.webserver.start()
 
+    def get_transcoder_by_id(self, file_id):
+        """Get the transcoder serving the queued file with this media id"""
+        i = self._files_index.get(self._file_by_id.get(file_id))
+        if i is not None:
+            return self.files_data[i][2]
+        return None
+
     def get_current_thumbnail(self):
         """Get thumbnail path for current file"""
-        if not self.current_file:
+        i = self._files_index.get(self.current_file)
+        if i is None:
             return None
-        for fn, fmd, _, _ in self.files_data:
-            if fn == self.current_file and fmd and fmd.thumbnail_fn:
-                return fmd.thumbnail_fn
+        _, fmd, _, _ = self.files_data[i]
+        if fmd and fmd.thumbnail_fn:
+            return fmd.thumbnail_fn
         return None
 
     def check_ffmpeg(self):
@@ -474,6 +558,9 @@ class QtCastWindow(QMainWindow):
         """Discover Chromecasts on the network"""
         self.chromecast_combo.clear()
         self.chromecast_combo.addItem("Searching...")
+        if self.discovery_thread and self.discovery_thread.isRunning():
+            self.discovery_thread.cancel()
+            self.discovery_thread.wait()
         self.discovery_thread = ChromecastDiscoveryThread()
         self.discovery_thread.found.connect(self.on_chromecasts_found)
         self.discovery_thread.start()
@@ -503,6 +590,11 @@ class QtCastWindow(QMainWindow):
             if cc:
                 self.cast = cc
                 self.device_info_button.setEnabled(True)
+                if cc not in self._status_listeners:
+                    listener = CastStatusListener(cc, self.media_status_changed)
+                    cc.media_controller.register_status_listener(listener)
+                    self._status_listeners[cc] = listener
+                self._on_media_status(cc, cc.media_controller.status)
 
                 # Show brief capability summary
                 from .devices import get_device
@@ -520,10 +612,11 @@ class QtCastWindow(QMainWindow):
 
                 # Create transcoder for current file if one is selected
                 if self.current_file and self.video_stream:
-                    for i, (fn, fmd, _, duration) in enumerate(self.files_data):
-                        if fn == self.current_file and fmd.ready:
+                    i = self._files_index.get(self.current_file)
+                    if i is not None:
+                        _, fmd, _, _ = self.files_data[i]
+                        if fmd.ready:
                             self._create_transcoder(i, fmd)
-                            break
 
                 self.update_button_states()
         else:
@@ -625,15 +718,24 @@ class QtCastWindow(QMainWindow):
             "Media files (*.mp4 *.mkv *.avi *.mov *.mp3 *.wav);;All files (*.*)"
         )
         if files:
-            for fn in files:
+            self.queue_files(files)
+
+    def queue_files(self, fns):
+        """Queue several files, repainting the file table once"""
+        self.file_table.setUpdatesEnabled(False)
+        self.file_table.blockSignals(True)
+        try:
+            for fn in fns:
                 self.queue_file(fn)
+        finally:
+            self.file_table.blockSignals(False)
+            self.file_table.setUpdatesEnabled(True)
 
     def queue_file(self, fn):
         """Queue a single file"""
         # Check if already in queue
-        for file_fn, _, _, _ in self.files_data:
-            if file_fn == fn:
-                return
+        if fn in self._files_index:
+            return
 
         display_name = os.path.basename(fn)
         if len(display_name) > 50:
@@ -650,29 +752,49 @@ class QtCastWindow(QMainWindow):
         progress.setValue(0)
         self.file_table.setCellWidget(row, 2, progress)
 
-        # Parse metadata in background
+        # Stable id and content type for the media URL
+        ext = fn.rsplit(".", 1)[-1].lower()
+        file_id = hashlib.blake2b(os.fsencode(fn), digest_size=8).hexdigest()
+        mime = f"audio/{ext}" if ext in AUDIO_EXTS else "video/mp4"
+        self._media_info[fn] = (file_id, ext, mime)
+        self._file_by_id[file_id] = fn
+
+        # Parse metadata in background; the result is queued to the GUI thread,
+        # which only handles it once this row has been indexed
         def on_metadata_ready(fmd):
-            duration = get_media_duration(fn)
-            for i, (file_fn, _, existing_transcoder, _) in enumerate(self.files_data):
-                if file_fn == fn:
-                    # Preserve existing transcoder if any
-                    self.files_data[i] = (fn, fmd, existing_transcoder, duration)
-                    self.file_table.item(i, 1).setText(humanize_seconds(duration))
-                    break
+            duration = fmd.duration
+            if duration is None:
+                duration = get_media_duration(fn)
+            self.file_metadata_ready.emit(fmd, duration)
 
         fmd = FileMetadata(fn, on_metadata_ready)
         self.files_data.append((fn, fmd, None, None))
+        self._files_index[fn] = len(self.files_data) - 1
 
         # Select first file if none selected
         if len(self.files_data) == 1 and self.current_file is None:
             self.select_file(0)
 
+    def _on_file_metadata_ready(self, fmd, duration):
+        """Record a parsed file's duration in the queue"""
+        i = self._files_index.get(fmd.fn)
+        # Skip files removed (or removed and re-added) while being parsed
+        if i is not None and self.files_data[i][1] is fmd:
+            # Preserve existing transcoder if any
+            _, _, existing_transcoder, _ = self.files_data[i]
+            self.files_data[i] = (fmd.fn, fmd, existing_transcoder, duration)
+            self.file_table.item(i, 1).setText(humanize_seconds(duration))
+            # The first file is selected before its duration is known
+            if fmd.fn == self.current_file:
+                self.current_duration = duration
+
     def remove_selected_files(self):
         """Remove selected files from queue"""
         selected_rows = set(item.row() for item in self.file_table.selectedItems())
         for row in sorted(selected_rows, reverse=True):
             self.file_table.removeRow(row)
             del self.files_data[row]
+        self._files_index = {fn: i for i, (fn, _, _, _) in enumerate(self.files_data)}
 
     def on_file_double_clicked(self, row, col):
         """Handle file double-click"""
@@ -709,14 +831,19 @@ class QtCastWindow(QMainWindow):
     def _update_file_ui(self, index, fmd):
         """Update UI with file data (must be called on main thread)"""
         # Load thumbnail
-        if fmd.thumbnail_fn and os.path.isfile(fmd.thumbnail_fn):
-            pixmap = QPixmap(fmd.thumbnail_fn)
-            scaled = pixmap.scaled(
-                self.thumbnail_label.width(), 300,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.thumbnail_label.setPixmap(scaled)
+        if fmd.thumbnail_fn:
+            # Reuse the decoded and scaled thumbnail when reselecting a file
+            key = f"{fmd.thumbnail_fn}|{self.thumbnail_label.width()}"
+            scaled = QPixmapCache.find(key)
+            if scaled is None and os.path.isfile(fmd.thumbnail_fn):
+                scaled = QPixmap(fmd.thumbnail_fn).scaled(
+                    self.thumbnail_label.width(), 300,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+                QPixmapCache.insert(key, scaled)
+            if scaled is not None:
+                self.thumbnail_label.setPixmap(scaled)
 
         # Populate audio/video streams
         self.audio_combo.clear()
@@ -738,6 +865,9 @@ class QtCastWindow(QMainWindow):
         for sub in fmd.subtitles:
             self.subtitle_combo.addItem(sub.title, sub)
         self.subtitle_combo.addItem("Add subtitle file...", "browse")
+        if fmd.subtitles:
+            # Only the selected file pays for extracting its subtitle tracks
+            start_thread(fmd.ensure_subtitles_loaded, daemon=True)
 
         # Create transcoder if we have a cast selected
         if self.cast and self.video_stream:
@@ -763,19 +893,16 @@ class QtCastWindow(QMainWindow):
             )
 
             # Connect signals
-            transcoder.progress_updated.connect(
-                lambda bytes, secs: self._on_transcode_progress(index, bytes, secs, duration)
-            )
-            transcoder.transcode_completed.connect(
-                lambda: self._on_transcode_complete(index)
-            )
-            transcoder.transcode_error.connect(self.on_transcode_error)
+            self._transcode_pct.pop(fn, None)
+            if old_transcoder:
+                self._disconnect_transcoder(old_transcoder)
+            self._connect_transcoder(index, transcoder)
 
             self.files_data[index] = (fn, fmd, transcoder, duration)
             if fn == self.current_file:
                 self.current_transcoder = transcoder
 
-    def _create_transcoder_for_file(self, index, fmd):
+    def _create_transcoder_for_file(self, index, fmd, shared=False):
         """Create transcoder for a queued file using its own streams"""
         with self.transcoder_lock:
             fn, _, old_transcoder, duration = self.files_data[index]
@@ -796,40 +923,71 @@ class QtCastWindow(QMainWindow):
                 fmd,
                 video_stream,
                 audio_stream,
-                old_transcoder
+                old_transcoder,
+                shared=shared,
             )
 
             # Connect signals
-            transcoder.progress_updated.connect(
-                lambda bytes, secs: self._on_transcode_progress(index, bytes, secs, duration)
-            )
-            transcoder.transcode_completed.connect(
-                lambda: self._on_transcode_complete(index)
-            )
-            transcoder.transcode_error.connect(self.on_transcode_error)
+            self._transcode_pct.pop(fn, None)
+            if old_transcoder:
+                self._disconnect_transcoder(old_transcoder)
+            self._connect_transcoder(index, transcoder)
 
             self.files_data[index] = (fn, fmd, transcoder, duration)
             if fn == self.current_file:
                 self.current_transcoder = transcoder
 
-    def _on_transcode_progress(self, index, bytes, seconds, duration):
+    def _connect_transcoder(self, index, transcoder):
+        """Route a transcoder's signals to the row it belongs to"""
+        transcoder.progress_updated.connect(partial(self._on_transcode_progress, index))
+        transcoder.transcode_completed.connect(partial(self._on_transcode_complete, index))
+        transcoder.transcode_error.connect(self.on_transcode_error)
+
+    def _disconnect_transcoder(self, transcoder):
+        """Stop a replaced transcoder from updating the UI"""
+        for signal in (
+            transcoder.progress_updated,
+            transcoder.transcode_completed,
+            transcoder.transcode_error,
+        ):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass  # Nothing connected
+
+    def _on_transcode_progress(self, index, bytes, seconds):
         """Update transcode progress"""
+        if index >= len(self.files_data):
+            return
+        duration = self.files_data[index][3]
         if duration and duration > 0:
-            progress = int((seconds / duration) * 100)
+            progress = min(int((seconds / duration) * 100), 100)
+            fn = self.files_data[index][0]
+            # Skip repaints until the shown percentage actually moves
+            if progress <= self._transcode_pct.get(fn, -1):
+                return
+            self._transcode_pct[fn] = progress
             widget = self.file_table.cellWidget(index, 2)
             if widget:
-                widget.setValue(min(progress, 100))
+                widget.setValue(progress)
+            if fn == self.current_file and progress >= PRE_TRANSCODE_PERCENT:
+                self.prep_next_transcode()
 
-    def _on_transcode_complete(self, index):
+    def _on_transcode_complete(self, index, did_transcode=True):
         """Handle transcode completion"""
+        if index < len(self.files_data):
+            self._transcode_pct[self.files_data[index][0]] = 100
         widget = self.file_table.cellWidget(index, 2)
         if widget:
             widget.setValue(100)
-        # Pre-transcode the next file in queue
+        # Pre-transcode the next file in queue, now that a slot is free
         self.prep_next_transcode()
 
     def on_transcode_error(self, error_msg):
         """Handle transcode error"""
+        # The failed ffmpeg no longer holds a slot; nothing else would retry
+        # a pre-transcode that was waiting for one
+        self.prep_next_transcode()
         QMessageBox.critical(self, "Transcoding Error", error_msg[:500])
 
     def on_audio_changed(self, index):
@@ -839,10 +997,9 @@ class QtCastWindow(QMainWindow):
             self.video_stream, self.audio_stream = data
             # Recreate transcoder with new streams (only if cast is selected)
             if self.cast:
-                for i, (fn, fmd, _, duration) in enumerate(self.files_data):
-                    if fn == self.current_file:
-                        self._create_transcoder(i, fmd)
-                        break
+                i = self._files_index.get(self.current_file)
+                if i is not None:
+                    self._create_transcoder(i, self.files_data[i][1])
 
     def on_subtitle_changed(self, index):
         """Handle subtitle change"""
@@ -858,26 +1015,46 @@ class QtCastWindow(QMainWindow):
             if fn:
                 self.subtitles = convert_subtitles_to_webvtt(Path(fn))
         elif data:
-            self.subtitles = data._subtitles if hasattr(data, '_subtitles') else None
+            # Extraction may still be running a full ffmpeg pass, so wait
+            # for it off the GUI thread
+            self.subtitles = None
+            i = self._files_index.get(self.current_file)
+            fmd = self.files_data[i][1] if i is not None else None
+
+            def load():
+                if fmd:
+                    fmd.ensure_subtitles_loaded()
+                self.subtitles_loaded.emit(data)
+
+            start_thread(load, daemon=True)
         else:
             self.subtitles = None
 
+    def _on_subtitles_loaded(self, data):
+        """Apply embedded subtitles once they have been extracted"""
+        # Ignore tracks the user has already moved away from
+        if self.subtitle_combo.currentData() is data:
+            self.subtitles = data._subtitles if hasattr(data, '_subtitles') else None
+
     def show_file_info(self):
         """Show file information dialog"""
         if not self.current_file:
             return
 
         info_text = f"File: {os.path.basename(self.current_file)}\n"
-        for fn, fmd, _, _ in self.files_data:
-            if fn == self.current_file:
-                fmd.wait()
+        i = self._files_index.get(self.current_file)
+        if i is not None:
+            _, fmd, _, _ = self.files_data[i]
+            # Don't block the GUI thread on a probe that's still running
+            if not fmd.ready:
+                info_text += "Still reading file metadata, try again shortly.\n"
+            else:
                 if fmd.video_streams:
                     info_text += "Video: " + ", ".join(f"{s.title} ({s.codec})" for s in fmd.video_streams) + "\n"
                 if fmd.audio_streams:
                     info_text += "Audio: " + ", ".join(s.details() for s in fmd.audio_streams) + "\n"
                 if fmd.subtitles:
                     info_text += "Subtitles: " + ", ".join(s.title for s in fmd.subtitles) + "\n"
-                break
 
         if self.cast:
             info_text += f"\nDevice: {self.cast.cast_info.model_name} ({self.cast.cast_info.manufacturer})"
@@ -919,12 +1096,14 @@ class QtCastWindow(QMainWindow):
         if thumb_path:
             kwargs["thumb"] = self.webserver.get_thumbnail_url()
 
-        # Parse filename for metadata
-        metadata = parse_tv_filename(self.current_file)
-        if not metadata:
-            metadata = parse_movie_filename(self.current_file)
+        # Parse filename for metadata, once per file (None results included)
+        if self.current_file not in self._metadata_cache:
+            self._metadata_cache[self.current_file] = classify_filename(self.current_file)
+        metadata = self._metadata_cache[self.current_file]
 
         if metadata:
+            # Copy so the cached entry isn't modified
+            metadata = dict(metadata)
             # Add thumbnail to metadata images
             if thumb_path:
                 metadata["images"] = [{"url": self.webserver.get_thumbnail_url()}]
@@ -944,10 +1123,10 @@ class QtCastWindow(QMainWindow):
             # Fallback to filename
             kwargs["title"] = os.path.basename(self.current_file)
 
-        ext = self.current_file.split(".")[-1].lower()
+        file_id, ext, mime = self._media_info[self.current_file]
         mc.play_media(
-            f"{self.webserver.get_media_base_url()}/{hash(self.current_file)}.{ext}",
-            "audio/%s" % ext if ext in AUDIO_EXTS else "video/mp4",
+            self.webserver.get_file_url(file_id, ext),
+            mime,
             **kwargs,
         )
 
@@ -988,75 +1167,96 @@ class QtCastWindow(QMainWindow):
             self.cast.media_controller.seek(self.scrubber.value())
             self.seeking = False
 
-    def monitor_cast_status(self):
-        """Monitor Chromecast status and update UI"""
-        if not self.cast:
+    def _on_media_status(self, cast, status):
+        """Update UI from a media status pushed by the Chromecast"""
+        # Ignore late updates from a previously selected device
+        if cast is not self.cast:
             return
 
-        mc = self.cast.media_controller
-
         # Update player state
-        if mc.status.player_state != self.last_known_player_state:
+        if status.player_state != self.last_known_player_state:
             old_state = self.last_known_player_state
-            self.last_known_player_state = mc.status.player_state
+            self.last_known_player_state = status.player_state
             self.update_button_states()
 
-            if mc.status.player_state == "PLAYING":
+            if status.player_state == "PLAYING":
                 self.screen_saver_inhibitor.start()
+                self.scrubber_timer.start(SCRUBBER_INTERVAL)
             else:
                 self.screen_saver_inhibitor.stop()
+                self.scrubber_timer.stop()
 
             # Check for next file when playback finishes
-            if old_state == "PLAYING" and mc.status.player_state == "IDLE":
+            if old_state == "PLAYING" and status.player_state == "IDLE":
                 self.check_for_next_in_queue()
 
-        # Pre-transcode next file while playing
-        if mc.status.player_state == "PLAYING":
+        if status.player_state == "PLAYING":
+            # Pre-transcode next file while playing
             self.prep_next_transcode()
 
-        # Update scrubber position
-        if not self.seeking and mc.status.player_state == "PLAYING":
-            if mc.status.current_time != self.last_known_current_time:
-                self.last_known_current_time = mc.status.current_time
+            # Re-anchor the scrubber to the reported position
+            if status.current_time != self.last_known_current_time:
+                self.last_known_current_time = status.current_time
                 self.last_time_current_time = time.time()
+            self.update_scrubber()
 
-            if self.last_time_current_time:
-                elapsed = time.time() - self.last_time_current_time
-                current = int(self.last_known_current_time + elapsed)
-                self.scrubber.setValue(current)
-                self.time_label.setText(humanize_seconds(current))
+    def update_scrubber(self):
+        """Advance the scrubber from the last reported playback position"""
+        if self.seeking or self.last_known_player_state != "PLAYING":
+            return
+        if self.last_time_current_time:
+            elapsed = time.time() - self.last_time_current_time
+            current = int(self.last_known_current_time + elapsed)
+            self.scrubber.setValue(current)
+            self.time_label.setText(humanize_seconds(current))
 
     def check_for_next_in_queue(self):
         """When current file finishes, auto-play the next one in queue"""
         if not self.cast or not self.current_file:
             return
 
-        next_file = False
-        for i, (fn, fmd, transcoder, duration) in enumerate(self.files_data):
-            if next_file and fmd.ready:
+        current = self._files_index.get(self.current_file)
+        if current is None:
+            return
+        for i in range(current + 1, len(self.files_data)):
+            fn, fmd, _, _ = self.files_data[i]
+            if fmd.ready:
                 print(f"Auto-playing next in queue: {os.path.basename(fn)}")
                 self.select_file(i)
                 # Auto-start playback after a short delay
                 QTimer.singleShot(500, self.toggle_play)
                 return
-            if fn == self.current_file:
-                next_file = True
 
     def prep_next_transcode(self):
         """Pre-transcode the next file in queue while current is playing"""
         if not self.cast or not self.current_file:
             return
 
-        transcode_next = False
-        for i, (fn, fmd, transcoder, duration) in enumerate(self.files_data):
-            if transcode_next and not transcoder and fmd.ready:
+        current = self._files_index.get(self.current_file)
+        if current is None:
+            return
+        # Start pre-transcoding once the current file's transcode is far enough
+        transcoder = self.files_data[current][2]
+        if not transcoder:
+            return
+        if (
+            not transcoder.done
+            and self._transcode_pct.get(self.current_file, 0) < PRE_TRANSCODE_PERCENT
+        ):
+            return
+        running = sum(
+            1 for _, _, t, _ in self.files_data if t and t.p and t.p.poll() is None
+        )
+        if running >= MAX_CONCURRENT_TRANSCODES:
+            return
+        for i in range(current + 1, len(self.files_data)):
+            fn, fmd, transcoder, _ = self.files_data[i]
+            if not transcoder and fmd.ready:
                 print(f"Pre-transcoding next file: {os.path.basename(fn)}")
-                # Use the file's own streams, not the current file's streams
-                self._create_transcoder_for_file(i, fmd)
+                # Use the file's own streams, not the current file's streams;
+                # share the CPU if another transcode is still running
+                self._create_transcoder_for_file(i, fmd, shared=running > 0)
                 return
-            # Start pre-transcoding after current file's transcoder is done
-            if fn == self.current_file and transcoder and transcoder.done:
-                transcode_next = True
 
     def update_button_states(self):
         """Update button enabled states"""
@@ -1085,10 +1285,8 @@ class QtCastWindow(QMainWindow):
 
     def dropEvent(self, event: QDropEvent):
         """Handle drop event"""
-        for url in event.mimeData().urls():
-            fn = url.toLocalFile()
-            if os.path.isfile(fn):
-                self.queue_file(fn)
+        fns = (url.toLocalFile() for url in event.mimeData().urls())
+        self.queue_files(expand_media_paths(fns))
 
     def closeEvent(self, event):
         """Handle window close"""
@@ -1123,9 +1321,9 @@ def main():
 
     # Add files from command line
     if args.files:
-        for fn in args.files:
-            if os.path.isfile(fn):
-                window.queue_file(os.path.abspath(fn))
+        window.queue_files(
+            expand_media_paths(os.path.abspath(fn) for fn in args.files)
+        )
 
     window.show()
 
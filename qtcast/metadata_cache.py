@@ -0,0 +1,69 @@
+"""
+On-disk cache of ffprobe results and thumbnails, keyed by (path, mtime, size)
+"""
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "qtcast"
+    / "metadata"
+)
+
+# Entries already read or written this session, to skip repeated disk hits
+_memory: dict[Path, tuple[dict, str]] = {}
+
+
+def _entry_path(file_path: str) -> Path | None:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(file_path)}:{st.st_mtime_ns}:{st.st_size}"
+    return CACHE_DIR / hashlib.sha1(key.encode()).hexdigest()
+
+
+def load_metadata(file_path: str) -> tuple[dict, str] | None:
+    """
+    Return the cached (probe data, thumbnail path) for a file, if still valid.
+    """
+    entry = _entry_path(file_path)
+    if entry is None:
+        return None
+    if entry in _memory:
+        return _memory[entry]
+
+    thumbnail = entry.with_suffix(".jpg")
+    try:
+        data = json.loads(entry.with_suffix(".json").read_text())
+    except (OSError, ValueError):
+        return None
+    if not thumbnail.is_file():
+        return None
+    _memory[entry] = (data, str(thumbnail))
+    return _memory[entry]
+
+
+def store_metadata(file_path: str, data: dict, thumbnail_fn: str) -> str:
+    """
+    Cache probe data for a file, moving its thumbnail into the cache.
+
+    Returns the thumbnail path to use from now on.
+    """
+    entry = _entry_path(file_path)
+    if entry is None:
+        return thumbnail_fn
+
+    thumbnail = entry.with_suffix(".jpg")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.move(thumbnail_fn, thumbnail)
+        # Written last so a half-written entry is never picked up
+        entry.with_suffix(".json").write_text(json.dumps(data))
+    except OSError:
+        return str(thumbnail) if thumbnail.is_file() else thumbnail_fn
+    _memory[entry] = (data, str(thumbnail))
+    return str(thumbnail)
@@ -1,18 +1,28 @@
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 import tempfile
 import pycaption
 
 
 def convert_subtitles_to_webvtt(subtitles_path: Path) -> str:
-    subtitles_bytes = Path(subtitles_path).read_bytes()
+    st = Path(subtitles_path).stat()
+    return _convert_subtitles_to_webvtt(
+        str(subtitles_path), st.st_mtime_ns, st.st_size
+    )
+
+
+@lru_cache(maxsize=16)
+def _convert_subtitles_to_webvtt(path: str, mtime_ns: int, size: int) -> str:
+    # mtime_ns and size are only part of the cache key, so that an edited
+    # file gets converted again
+    subtitles_bytes = Path(path).read_bytes()
     try:
-        subtitles = subtitles_bytes.decode("utf-8")
+        # utf-8-sig drops the BOM if present
+        subtitles = subtitles_bytes.decode("utf-8-sig")
     except UnicodeDecodeError:
         subtitles = subtitles_bytes.decode("latin-1")
 
-    subtitles.removeprefix("\ufeff")  # Remove BOM if present
-
     converter = pycaption.CaptionConverter()
     converter.read(subtitles, pycaption.detect_format(subtitles)())
     return converter.write(pycaption.WebVTTWriter())
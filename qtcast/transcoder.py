@@ -2,24 +2,24 @@
 Transcoder for QtCast - handles media transcoding for Chromecast compatibility
 """
 import os
-import re
 import subprocess
 import tempfile
 import threading
 from PyQt6.QtCore import QObject, pyqtSignal
 
 from .devices import get_device, Device
-from .ffmpeg import parse_ffmpeg_time
+from .utils import get_ffmpeg_threads
 
 
 AUDIO_EXTS = ("aac", "mp3", "wav")
+MAX_ERROR_OUTPUT = 64 * 1024  # bytes of ffmpeg output kept for error reports
 
 
 class Transcoder(QObject):
     """Handles transcoding of media files for Chromecast compatibility"""
 
     # Signals for thread-safe communication
-    progress_updated = pyqtSignal(int, int)  # progress_bytes, progress_seconds
+    progress_updated = pyqtSignal(int, float)  # progress_bytes, progress_seconds
     transcode_completed = pyqtSignal(bool)  # did_transcode
     transcode_error = pyqtSignal(str)  # error_message
 
@@ -30,6 +30,7 @@ class Transcoder(QObject):
         video_stream,
         audio_stream,
         prev_transcoder=None,
+        shared=False,
     ):
         super().__init__()
         self.fmd = fmd
@@ -39,6 +40,8 @@ class Transcoder(QObject):
         self.cast = cast
         self.source_fn = fn
         self.p = None
+        # Notified whenever progress, done or destroyed change
+        self._progress_cv = threading.Condition()
 
         # Get device capabilities
         self.device = get_device(cast.cast_info.manufacturer, cast.model_name)
@@ -54,6 +57,10 @@ class Transcoder(QObject):
         self.transcode = (
             transcode_container or self.transcode_video or self.transcode_audio
         )
+        # Only the container is wrong, so streams are copied as-is
+        self.remux_only = transcode_container and not (
+            self.transcode_video or self.transcode_audio
+        )
         self.trans_fn = None
 
         self.progress_bytes = 0
@@ -85,6 +92,10 @@ class Transcoder(QObject):
 
             self.transcode_cmd = [
                 "ffmpeg",
+                # Machine-readable key=value progress records on stdout
+                "-nostats",
+                "-progress",
+                "pipe:1",
                 "-i",
                 self.source_fn,
                 "-map",
@@ -101,6 +112,13 @@ class Transcoder(QObject):
                 "-c:v",
                 "h264" if self.transcode_video else "copy",
             ]
+            if self.transcode_video:
+                self.transcode_cmd += ["-preset", "veryfast"]
+            if self.remux_only:
+                # A remux takes seconds and is served once complete, so put the
+                # index up front for quick startup and seeking
+                self.transcode_cmd += ["-movflags", "+faststart"]
+            self.transcode_cmd += ["-threads", str(get_ffmpeg_threads(shared))]
             self.transcode_cmd += [self.trans_fn]
             print(" ".join(["'%s'" % s if " " in s else s for s in self.transcode_cmd]))
             print("---------------------")
@@ -138,55 +156,75 @@ class Transcoder(QObject):
     def wait_for_byte(self, offset, buffer=128 * 1024 * 1024):
         if self.done:
             return
-        import time
         if self.source_fn.lower().split(".")[-1] == "mp4":
-            while offset > self.progress_bytes + buffer:
-                print("waiting for", offset, "at", self.progress_bytes + buffer)
-                time.sleep(2)
+            def available():
+                return offset <= self.progress_bytes + buffer
+
+            print("waiting for", offset, "at", self.progress_bytes + buffer)
         else:
-            while not self.done:
-                print("waiting for transcode to finish")
-                time.sleep(2)
+            def available():
+                return False
+
+            print("waiting for transcode to finish")
+        with self._progress_cv:
+            while (
+                not self.done
+                and not self.destroyed
+                and self.p.poll() is None
+                and not available()
+            ):
+                # Timeout only guards against a missed wakeup
+                self._progress_cv.wait(timeout=5)
         print("done waiting")
 
+    def _notify_progress(self):
+        with self._progress_cv:
+            self._progress_cv.notify_all()
+
     def monitor(self):
-        line = b""
-        r = re.compile(r"=\s+")
-        total_output = b""
+        fd = self.p.stdout.fileno()
+        buf = bytearray()
+        # Only the tail of ffmpeg's output is kept, for error reports
+        total_output = bytearray()
         while self.p and not self.destroyed:
-            byte = self.p.stdout.read(1)
-            total_output += byte
-            if byte == b"" and self.p.poll() is not None:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                self.p.wait()
                 break
-            if byte != b"":
-                line += byte
-                if byte == b"\r":
-                    line = line.decode()
-                    line = r.sub("=", line)
-                    items = [s.split("=") for s in line.split()]
-                    d = dict([x for x in items if len(x) == 2])
-                    print(d)
-                    self.progress_bytes = (
-                        int(d.get("size", "0kb").lower().rstrip("kib")) * 1024
-                    )
-                    self.progress_seconds = parse_ffmpeg_time(d.get("time", "00:00:00"))
-                    # Emit signal for UI update
+            total_output += chunk
+            del total_output[:-MAX_ERROR_OUTPUT]
+            buf += chunk
+            while (i := buf.find(b"\n")) >= 0:
+                key, _, value = buf[:i].partition(b"=")
+                del buf[: i + 1]
+                try:
+                    if key == b"total_size":
+                        self.progress_bytes = int(value)
+                    elif key == b"out_time_us":
+                        self.progress_seconds = max(int(value), 0) / 1_000_000
+                except ValueError:
+                    pass  # N/A until the first packet is written
+                if key == b"progress":
+                    self._notify_progress()
+                    # ffmpeg only writes a record about twice a second
                     self.progress_updated.emit(self.progress_bytes, self.progress_seconds)
-                    line = b""
         if self.p:
             self.p.stdout.close()
             # Don't report error if transcoder was explicitly destroyed (replaced)
             if self.p.returncode and not self.destroyed:
                 print("--== transcode error ==--")
-                print(total_output)
-                self.transcode_error.emit(total_output.decode())
+                print(bytes(total_output))
+                self.transcode_error.emit(total_output.decode(errors="replace"))
+                self._notify_progress()
                 return
         if not self.destroyed:
             self.done = True
+            self._notify_progress()
             self.transcode_completed.emit(True)
 
     def destroy(self):
         self.destroyed = True
+        self._notify_progress()
         if self.p and self.p.poll() is None:
             self.p.terminate()
         if self.trans_fn and os.path.isfile(self.trans_fn):
@@ -2,6 +2,7 @@ import os
 import socket
 import threading
 from collections.abc import Callable, Iterable
+from functools import lru_cache
 
 
 def get_webserver_ip_address() -> str:
@@ -28,6 +29,15 @@ def get_webserver_port() -> int:
         return port
 
 
+def get_ffmpeg_threads(shared: bool = False) -> int:
+    # 0 lets ffmpeg pick a thread count for the machine; a transcode sharing
+    # it with another gets half the cores so the one being played keeps up
+    try:
+        return max(int(os.environ["QTCAST_FFMPEG_THREADS"]), 0)
+    except (KeyError, ValueError, TypeError):
+        return max((os.cpu_count() or 2) // 2, 1) if shared else 0
+
+
 def throttle(seconds: float) -> Callable[[Callable], Callable]:
     def decorator(f: Callable) -> Callable:
         timer = None
@@ -86,7 +96,11 @@ def start_thread(
 
 
 def humanize_seconds(seconds: float) -> str:
-    seconds = int(seconds)
+    return _humanize_seconds(int(seconds))
+
+
+@lru_cache(maxsize=256)
+def _humanize_seconds(seconds: int) -> str:
     hours = seconds // 3600
     minutes = (seconds // 60) % 60
     seconds = seconds % 60
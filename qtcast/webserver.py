@@ -1,9 +1,23 @@
+import hashlib
+import os
+
 import bottle
 from paste import httpserver
 from paste.translogger import TransLogger
 
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
 from .utils import get_webserver_ip_address, get_webserver_port
 
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, HEAD",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
 
 class QtCastWebServer:
     def __init__(self, get_subtitles, get_transcoder, get_thumbnail):
@@ -12,29 +26,44 @@ class QtCastWebServer:
         self.get_subtitles = get_subtitles
         self.get_transcoder = get_transcoder
         self.get_thumbnail = get_thumbnail
+        base = f"http://{self.ip}:{self.port}"
+        self._subtitles_url = f"{base}/subtitles.vtt"
+        self._media_base_url = f"{base}/media/"
+        self._thumbnail_url = f"{base}/thumbnail.jpg"
+        self._file_urls: dict[tuple[str, str], str] = {}
+        # Chromecasts fetch these several times per load (HEAD, probe, body),
+        # so keep the encoded bytes around until the source changes
+        self._subtitles_cache: tuple[str, bytes, str] | None = None
+        self._thumbnail_cache: dict[str, tuple[int, bytes]] = {}
         self.app = bottle.Bottle()
         self._setup_routes()
 
     def get_subtitles_url(self) -> str:
-        return f"http://{self.ip}:{self.port}/subtitles.vtt"
+        return self._subtitles_url
 
     def get_media_base_url(self) -> str:
-        return f"http://{self.ip}:{self.port}/media/"
+        return self._media_base_url
 
     def get_thumbnail_url(self) -> str:
-        return f"http://{self.ip}:{self.port}/thumbnail.jpg"
+        return self._thumbnail_url
+
+    def get_file_url(self, file_id: str, ext: str) -> str:
+        key = (file_id, ext)
+        url = self._file_urls.get(key)
+        if url is None:
+            url = self._file_urls[key] = f"{self._media_base_url}{file_id}.{ext}"
+        return url
 
     def _setup_routes(self) -> None:
         app = self.app
 
         @app.route("/subtitles.vtt")
         def subtitles():
-            response = bottle.response
-            response.headers["Access-Control-Allow-Origin"] = "*"
-            response.headers["Access-Control-Allow-Methods"] = "GET, HEAD"
-            response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-            response.headers["Content-Type"] = "text/vtt"
-            return self.get_subtitles()
+            body, etag = self._encode_subtitles(self.get_subtitles() or "")
+            headers = {**CORS_HEADERS, "Content-Type": "text/vtt", "ETag": etag}
+            if bottle.request.headers.get("If-None-Match") == etag:
+                return bottle.HTTPResponse(status=304, headers=headers)
+            return bottle.HTTPResponse(body, headers=headers)
 
         @app.get("/media/<id>.<ext>")
         def video(id, ext):
@@ -46,28 +75,53 @@ class QtCastWebServer:
             )
             print("ranges", ranges)
             offset, end = ranges[0]
-            transcoder = self.get_transcoder()
+            transcoder = self.get_transcoder(id)
+            if transcoder is None:
+                bottle.abort(404, "Unknown media id")
             transcoder.wait_for_byte(offset)
             response = bottle.static_file(transcoder.fn, root="/")
             response.headers.pop("Last-Modified", None)
-            response.headers["Access-Control-Allow-Origin"] = "*"
-            response.headers["Access-Control-Allow-Methods"] = "GET, HEAD"
-            response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+            response.headers.update(CORS_HEADERS)
             return response
 
         @app.get("/thumbnail.jpg")
         def thumbnail():
             thumb_path = self.get_thumbnail()
-            if thumb_path:
-                response = bottle.static_file(thumb_path, root="/")
-                response.headers["Access-Control-Allow-Origin"] = "*"
-                response.headers["Access-Control-Allow-Methods"] = "GET, HEAD"
-                response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-                return response
+            body = self._read_thumbnail(thumb_path) if thumb_path else None
+            if body is not None:
+                headers = {
+                    **CORS_HEADERS,
+                    "Content-Type": "image/jpeg",
+                    "Cache-Control": "max-age=3600",
+                }
+                return bottle.HTTPResponse(body, headers=headers)
             bottle.abort(404, "No thumbnail available")
 
+    def _encode_subtitles(self, subtitles: str) -> tuple[bytes, str]:
+        cached = self._subtitles_cache
+        if cached is None or cached[0] is not subtitles:
+            body = subtitles.encode()
+            etag = '"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest()
+            cached = self._subtitles_cache = (subtitles, body, etag)
+        return cached[1], cached[2]
+
+    def _read_thumbnail(self, path: str) -> bytes | None:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            cached = self._thumbnail_cache.get(path)
+            if cached is None or cached[0] != mtime:
+                with open(path, "rb") as f:
+                    cached = self._thumbnail_cache[path] = (mtime, f.read())
+        except OSError:
+            return None
+        return cached[1]
+
     def start(self) -> None:
         handler = TransLogger(self.app, setup_console_handler=True)
+        if waitress is not None:
+            # Buffers socket writes, which streams faster than paste
+            waitress.serve(handler, host=self.ip, port=self.port, threads=8)
+            return
         httpserver.serve(
             handler, host=self.ip, port=str(self.port), daemon_threads=True
         )
@@ -2,134 +2,236 @@
 """
 Test script to demonstrate Chromecast detection and capability recognition
 """
+import io
 import sys
-import time
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QTimer
 
-# Add qtcast to path
-sys.path.insert(0, '/home/teemu/qtcast')
-
-print("=" * 70)
-print("QtCast - Chromecast Detection Test")
-print("=" * 70)
-print()
-
-print("Step 1: Importing modules...")
-from qtcast.main import ChromecastDiscoveryThread
-from qtcast.devices import get_device
-import pychromecast
-
-print("✓ Modules loaded")
-print()
-
-print("Step 2: Discovering Chromecasts on network...")
-print("  Scanning local network for Chromecast devices...")
-print("  (This may take up to 10 seconds)")
-print()
-
-# Create QApplication (required for QThread)
-app = QApplication(sys.argv)
-
-# Create discovery thread
-discovery = ChromecastDiscoveryThread()
-chromecasts_found = []
-
-def on_found(chromecasts):
-    global chromecasts_found
-    chromecasts_found = chromecasts
-
-    print("-" * 70)
-    print(f"✓ Discovery Complete: Found {len(chromecasts)} device(s)")
-    print("-" * 70)
+# Report separators
+SEP_EQ = "=" * 70
+SEP_DASH = "-" * 70
+
+# Status symbols, with ASCII stand-ins for terminals that can't encode them
+_UTF8 = (sys.stdout.encoding or "").lower().replace("-", "") == "utf8"
+OK, BAD, ARROW, BULLET, WARN = (
+    ("✓", "✗", "→", "•", "⚠") if _UTF8 else ("[OK]", "[X]", "->", "*", "(!)")
+)
+
+# Indexed by a capability flag
+SUPPORTED = (f"{BAD} Not supported", f"{OK} Supported")
+
+# Report labels, padded once
+(
+    _LBL_FRIENDLY,
+    _LBL_MANUFACTURER,
+    _LBL_MODEL,
+    _LBL_CAST_TYPE,
+    _LBL_UUID,
+    _LBL_IP,
+    _LBL_RECORD,
+) = (
+    f"  {label:<20} "
+    for label in (
+        "Friendly Name:",
+        "Manufacturer:",
+        "Model Name:",
+        "Cast Type:",
+        "UUID:",
+        "IP Address:",
+        "Device Record:",
+    )
+)
+
+# Report sections that only depend on the device's (h265, ac3) support,
+# joined into ready-to-write text
+_DIRECT = "Direct stream (no transcode)"
+_TRANSCODE_TABLE = {
+    (h265, ac3): "".join(line + "\n" for line in (
+        "  Transcoding Behavior:",
+        f"    {BULLET} H.264 video {ARROW} {_DIRECT}",
+        f"    {BULLET} H.265 video {ARROW} {_DIRECT if h265 else 'Transcode to H.264'}",
+        f"    {BULLET} AAC audio   {ARROW} {_DIRECT}",
+        f"    {BULLET} MP3 audio   {ARROW} {_DIRECT}",
+        f"    {BULLET} AC3 audio   {ARROW} {_DIRECT if ac3 else 'Transcode to AAC/MP3'}",
+        f"    {BULLET} E-AC3 audio {ARROW} {_DIRECT if ac3 else 'Transcode to AAC/MP3'}",
+    ))
+    for h265 in (False, True)
+    for ac3 in (False, True)
+}
+_EXAMPLE_TABLE = {
+    (h265, ac3): "".join(line + "\n" for line in (
+        "  Example: 1080p MKV with H.264 video + E-AC3 5.1 audio",
+        *(
+            (
+                f"    {ARROW} Container remux only (video & audio copied)",
+                f"    {ARROW} Processing time: ~2-3 seconds for 20-minute video",
+                f"    {ARROW} Quality: Perfect (no re-encoding)",
+            )
+            if h265 and ac3
+            else (
+                f"    {ARROW} Full transcode required",
+                f"    {ARROW} Processing time: ~5 minutes for 20-minute video",
+                f"    {ARROW} Quality: Slightly reduced (re-encoding)",
+            )
+        ),
+    ))
+    for h265 in (False, True)
+    for ac3 in (False, True)
+}
+
+
+def report_devices(cast_infos, get_device):
+    print(SEP_DASH)
+    print(f"{OK} Discovery Complete: Found {len(cast_infos)} device(s)")
+    print(SEP_DASH)
     print()
 
-    for i, cc in enumerate(chromecasts, 1):
-        cc.wait()  # Wait for device info to load
-
-        print(f"Device #{i}: {cc.name}")
-        print(f"  {'Friendly Name:':<20} {cc.cast_info.friendly_name}")
-        print(f"  {'Manufacturer:':<20} {cc.cast_info.manufacturer}")
-        print(f"  {'Model Name:':<20} {cc.model_name}")
-        print(f"  {'Cast Type:':<20} {cc.cast_type}")
-        print(f"  {'UUID:':<20} {cc.uuid}")
-        print(f"  {'IP Address:':<20} {cc.cast_info.host}:{cc.cast_info.port}")
-        print()
+    # Discovery already fetched each device's info, so report from the
+    # CastInfo instead of connecting to every device
+    for i, info in enumerate(cast_infos, 1):
+        # One write per device report
+        buf = io.StringIO()
+        print(f"Device #{i}: {info.friendly_name}", file=buf)
+        print(_LBL_FRIENDLY + str(info.friendly_name), file=buf)
+        print(_LBL_MANUFACTURER + str(info.manufacturer), file=buf)
+        print(_LBL_MODEL + str(info.model_name), file=buf)
+        print(_LBL_CAST_TYPE + str(info.cast_type), file=buf)
+        print(_LBL_UUID + str(info.uuid), file=buf)
+        print(f"{_LBL_IP}{info.host}:{info.port}", file=buf)
+        print(file=buf)
 
         # Get device capabilities from database
-        print("  Checking QtCast device capabilities database...")
-        device = get_device(cc.cast_info.manufacturer, cc.model_name)
+        print("  Checking QtCast device capabilities database...", file=buf)
+        device = get_device(info.manufacturer, info.model_name)
+
+        print(f"{_LBL_RECORD}{device.manufacturer} / {device.model_name}", file=buf)
+        print(file=buf)
+        print("  Codec Support:", file=buf)
+        print(f"    H.264 (AVC):       {OK} Always supported", file=buf)
+        print(f"    H.265 (HEVC):      {SUPPORTED[device.h265]}", file=buf)
+        print(f"    AAC Audio:         {OK} Always supported", file=buf)
+        print(f"    MP3 Audio:         {OK} Always supported", file=buf)
+        print(f"    AC3/E-AC3 (Dolby): {SUPPORTED[device.ac3]}", file=buf)
+        print(file=buf)
+
+        buf.write(_TRANSCODE_TABLE[device.h265, device.ac3])
+        print(file=buf)
+        print("  Container Handling:", file=buf)
+        print(f"    {BULLET} MP4 files   {ARROW} Direct stream", file=buf)
+        print(f"    {BULLET} MKV files   {ARROW} Remux to MP4 (~100x realtime)", file=buf)
+        print(f"    {BULLET} AVI files   {ARROW} Remux to MP4 (~100x realtime)", file=buf)
+        print(file=buf)
 
-        print(f"  {'Device Record:':<20} {device.manufacturer} / {device.model_name}")
-        print()
-        print("  Codec Support:")
-        print(f"    H.264 (AVC):       ✓ Always supported")
-        print(f"    H.265 (HEVC):      {'✓ Supported' if device.h265 else '✗ Not supported'}")
-        print(f"    AAC Audio:         ✓ Always supported")
-        print(f"    MP3 Audio:         ✓ Always supported")
-        print(f"    AC3/E-AC3 (Dolby): {'✓ Supported' if device.ac3 else '✗ Not supported'}")
-        print()
+        # Show what this means for a typical file
+        buf.write(_EXAMPLE_TABLE[device.h265, device.ac3])
+        print(file=buf)
+        print(SEP_EQ, file=buf)
+        sys.stdout.write(buf.getvalue())
+
+
+def run(ChromecastDiscoveryThread, get_device, first_only=False):
+    """Discover devices, report on them and return the ones found"""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    from qtcast.device_cache import save_known_devices
+
+    found = []
+
+    # Create QApplication (required for QThread)
+    app = QApplication(sys.argv)
+
+    # Create discovery thread
+    # mDNS answers arrive within milliseconds on a LAN, so browse briefly
+    discovery = ChromecastDiscoveryThread(timeout=3, max_devices=1 if first_only else None)
+
+    # Safety net in case discovery never reports back
+    watchdog = QTimer()
+    watchdog.setSingleShot(True)
+    watchdog.timeout.connect(lambda: (print(f"\n{WARN} Discovery timeout after 5 seconds\n"), app.quit()))
+
+    def on_found(chromecasts):
+        found.extend(chromecasts)
+
+        # Discovery finished on its own, so the watchdog isn't needed
+        watchdog.stop()
+        discovery.wait(1000)
+
+        if first_only:
+            chromecasts = chromecasts[:1]
+        cast_infos = [cc.cast_info for cc in chromecasts]
+        save_known_devices(cast_infos)
+        report_devices(cast_infos, get_device)
+
+        # Quit the application
+        QTimer.singleShot(100, app.quit)
+
+    print("  Initiating discovery thread...")
+    discovery.found.connect(on_found)
+    discovery.start()
+    watchdog.start(5000)
+
+    # Run the event loop
+    app.exec()
+    return found
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Chromecast detection test")
+    parser.add_argument(
+        "--first-only",
+        action="store_true",
+        help="stop as soon as one device has been found and reported",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always run mDNS discovery instead of checking devices seen last time",
+    )
+    args = parser.parse_args()
+
+    print(SEP_EQ)
+    print("QtCast - Chromecast Detection Test")
+    print(SEP_EQ)
+    print()
 
-        print("  Transcoding Behavior:")
-        if device.h265:
-            print("    • H.264 video → Direct stream (no transcode)")
-            print("    • H.265 video → Direct stream (no transcode)")
-        else:
-            print("    • H.264 video → Direct stream (no transcode)")
-            print("    • H.265 video → Transcode to H.264")
-
-        if device.ac3:
-            print("    • AAC audio   → Direct stream (no transcode)")
-            print("    • MP3 audio   → Direct stream (no transcode)")
-            print("    • AC3 audio   → Direct stream (no transcode)")
-            print("    • E-AC3 audio → Direct stream (no transcode)")
-        else:
-            print("    • AAC audio   → Direct stream (no transcode)")
-            print("    • MP3 audio   → Direct stream (no transcode)")
-            print("    • AC3 audio   → Transcode to AAC/MP3")
-            print("    • E-AC3 audio → Transcode to AAC/MP3")
+    print("Step 1: Importing modules...")
+    from qtcast.main import ChromecastDiscoveryThread
+    from qtcast.devices import get_device
 
-        print()
-        print("  Container Handling:")
-        print("    • MP4 files   → Direct stream")
-        print("    • MKV files   → Remux to MP4 (~100x realtime)")
-        print("    • AVI files   → Remux to MP4 (~100x realtime)")
-        print()
+    print(f"{OK} Modules loaded")
+    print()
 
-        # Show what this means for a typical file
-        print("  Example: 1080p MKV with H.264 video + E-AC3 5.1 audio")
-        if device.h265 and device.ac3:
-            print("    → Container remux only (video & audio copied)")
-            print("    → Processing time: ~2-3 seconds for 20-minute video")
-            print("    → Quality: Perfect (no re-encoding)")
-        else:
-            print("    → Full transcode required")
-            print("    → Processing time: ~5 minutes for 20-minute video")
-            print("    → Quality: Slightly reduced (re-encoding)")
+    # Devices seen last time answer a direct connect far sooner than mDNS
+    from qtcast.device_cache import probe_known_devices
 
+    known = [] if args.no_cache else probe_known_devices(
+        limit=1 if args.first_only else None
+    )
+    if known:
+        print("Step 2: Checking previously seen Chromecasts...")
         print()
-        print("=" * 70)
-
-    # Quit the application
-    QTimer.singleShot(100, app.quit)
+        report_devices(known, get_device)
+        print(f"\n{OK} Detection test complete!")
+        print()
+        return 0
 
-print("  Initiating discovery thread...")
-discovery.found.connect(on_found)
-discovery.start()
+    print("Step 2: Discovering Chromecasts on network...")
+    print("  Scanning local network for Chromecast devices...")
+    print("  (This may take a few seconds)")
+    print()
 
-# Set a timeout
-QTimer.singleShot(15000, lambda: (print("\n⚠ Discovery timeout after 15 seconds\n"), app.quit()))
+    if not run(ChromecastDiscoveryThread, get_device, args.first_only):
+        print(f"\n{BAD} No Chromecasts found on the network")
+        print("\nTroubleshooting:")
+        print(f"  {BULLET} Make sure your Chromecast is powered on")
+        print(f"  {BULLET} Check that your computer and Chromecast are on the same network")
+        print(f"  {BULLET} Verify firewall allows mDNS (port 5353)")
+        return 1
 
-# Run the event loop
-app.exec()
+    print(f"\n{OK} Detection test complete!")
+    print()
+    return 0
 
-if not chromecasts_found:
-    print("\n✗ No Chromecasts found on the network")
-    print("\nTroubleshooting:")
-    print("  • Make sure your Chromecast is powered on")
-    print("  • Check that your computer and Chromecast are on the same network")
-    print("  • Verify firewall allows mDNS (port 5353)")
-    sys.exit(1)
 
-print("\n✓ Detection test complete!")
-print()
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,73 +2,99 @@
 """
 Test script to verify device info dialog content
 """
+import io
 import sys
-sys.path.insert(0, '/home/teemu/qtcast')
 
-from qtcast.devices import get_device, Device
+# Report separators
+SEP_EQ = "=" * 70
+SEP_DASH = "-" * 70
 
-print("=" * 70)
-print("QtCast - Device Info Dialog Content Test")
-print("=" * 70)
-print()
+# Status symbols, with ASCII stand-ins for terminals that can't encode them
+_UTF8 = (sys.stdout.encoding or "").lower().replace("-", "") == "utf8"
+OK, BAD, ARROW, BULLET, INFO, WARN = (
+    ("✓", "✗", "→", "•", "ℹ", "⚠") if _UTF8 else ("[OK]", "[X]", "->", "*", "(i)", "(!)")
+)
 
-# Test with Google TV Streamer (full capabilities)
-print("Test 1: Google TV Streamer (Full Capabilities)")
-print("-" * 70)
-device = get_device("Google", "Google TV Streamer")
-print(f"Manufacturer: {device.manufacturer}")
-print(f"Model Name: {device.model_name}")
-print(f"H.265 Support: {'✓ Supported' if device.h265 else '✗ Not supported'}")
-print(f"AC3 Support: {'✓ Supported' if device.ac3 else '✗ Not supported'}")
-print()
+# Indexed by a capability flag
+SUPPORTED = (f"{BAD} Not supported", f"{OK} Supported")
 
-print("Expected Dialog Content:")
-print("  - Device info table (name, manufacturer, model, etc.)")
-print("  - Codec support: H.264 ✓, H.265 ✓, AAC ✓, MP3 ✓, AC3/E-AC3 ✓")
-print("  - Transcoding: All direct stream (optimal)")
-print("  - Example: Container remux only, ~2-3 sec, perfect quality")
-print()
+_TABLE_LINE = "  - Device info table (name, manufacturer, model, etc.)"
 
-# Test with Chromecast Gen 1 (limited capabilities)
-print("Test 2: Chromecast Gen 1 (Limited Capabilities)")
-print("-" * 70)
-device = get_device("Google", "Chromecast")
-print(f"Manufacturer: {device.manufacturer}")
-print(f"Model Name: {device.model_name}")
-print(f"H.265 Support: {'✓ Supported' if device.h265 else '✗ Not supported'}")
-print(f"AC3 Support: {'✓ Supported' if device.ac3 else '✗ Not supported'}")
-print()
+# (title, manufacturer, model name, expected dialog content)
+CASES = (
+    (
+        "Test 1: Google TV Streamer (Full Capabilities)",
+        "Google",
+        "Google TV Streamer",
+        (
+            _TABLE_LINE,
+            f"  - Codec support: H.264 {OK}, H.265 {OK}, AAC {OK}, MP3 {OK}, AC3/E-AC3 {OK}",
+            "  - Transcoding: All direct stream (optimal)",
+            "  - Example: Container remux only, ~2-3 sec, perfect quality",
+        ),
+    ),
+    (
+        "Test 2: Chromecast Gen 1 (Limited Capabilities)",
+        "Google",
+        "Chromecast",
+        (
+            _TABLE_LINE,
+            f"  - Codec support: H.264 {OK}, H.265 {BAD}, AAC {OK}, MP3 {OK}, AC3/E-AC3 {BAD}",
+            f"  - Transcoding: H.265 {ARROW} H.264, AC3/E-AC3 {ARROW} AAC/MP3",
+            "  - Example: Full transcode, ~5 min, slightly reduced quality",
+        ),
+    ),
+    (
+        # 4K but no AC3
+        "Test 3: Chromecast Ultra (4K but no Dolby)",
+        "Google",
+        "Chromecast Ultra",
+        (
+            _TABLE_LINE,
+            f"  - Codec support: H.264 {OK}, H.265 {OK}, AAC {OK}, MP3 {OK}, AC3/E-AC3 {BAD}",
+            f"  - Transcoding: Video direct stream, AC3/E-AC3 {ARROW} AAC/MP3",
+            "  - Example: Full transcode (audio transcode needed)",
+        ),
+    ),
+)
 
-print("Expected Dialog Content:")
-print("  - Device info table (name, manufacturer, model, etc.)")
-print("  - Codec support: H.264 ✓, H.265 ✗, AAC ✓, MP3 ✓, AC3/E-AC3 ✗")
-print("  - Transcoding: H.265 → H.264, AC3/E-AC3 → AAC/MP3")
-print("  - Example: Full transcode, ~5 min, slightly reduced quality")
-print()
 
-# Test with Chromecast Ultra (partial capabilities - 4K but no AC3)
-print("Test 3: Chromecast Ultra (4K but no Dolby)")
-print("-" * 70)
-device = get_device("Google", "Chromecast Ultra")
-print(f"Manufacturer: {device.manufacturer}")
-print(f"Model Name: {device.model_name}")
-print(f"H.265 Support: {'✓ Supported' if device.h265 else '✗ Not supported'}")
-print(f"AC3 Support: {'✓ Supported' if device.ac3 else '✗ Not supported'}")
-print()
+def main():
+    from qtcast.devices import get_device
 
-print("Expected Dialog Content:")
-print("  - Device info table (name, manufacturer, model, etc.)")
-print("  - Codec support: H.264 ✓, H.265 ✓, AAC ✓, MP3 ✓, AC3/E-AC3 ✗")
-print("  - Transcoding: Video direct stream, AC3/E-AC3 → AAC/MP3")
-print("  - Example: Full transcode (audio transcode needed)")
-print()
+    print(SEP_EQ)
+    print("QtCast - Device Info Dialog Content Test")
+    print(SEP_EQ)
+    print()
 
-print("=" * 70)
-print("✓ Device capability detection working correctly!")
-print()
-print("To see the actual dialog in QtCast:")
-print("  1. Launch: ./launch-qtcast.sh")
-print("  2. Select your Chromecast from dropdown")
-print("  3. Click the ℹ button next to the refresh button")
-print("  4. View detailed device capabilities")
-print("=" * 70)
+    for title, manufacturer, model_name, expected in CASES:
+        # One write per test report
+        buf = io.StringIO()
+        print(title, file=buf)
+        print(SEP_DASH, file=buf)
+        device = get_device(manufacturer, model_name)
+        print(f"Manufacturer: {device.manufacturer}", file=buf)
+        print(f"Model Name: {device.model_name}", file=buf)
+        print(f"H.265 Support: {SUPPORTED[device.h265]}", file=buf)
+        print(f"AC3 Support: {SUPPORTED[device.ac3]}", file=buf)
+        print(file=buf)
+
+        print("Expected Dialog Content:", file=buf)
+        for line in expected:
+            print(line, file=buf)
+        print(file=buf)
+        sys.stdout.write(buf.getvalue())
+
+    print(SEP_EQ)
+    print(f"{OK} Device capability detection working correctly!")
+    print()
+    print("To see the actual dialog in QtCast:")
+    print("  1. Launch: ./launch-qtcast.sh")
+    print("  2. Select your Chromecast from dropdown")
+    print(f"  3. Click the {INFO} button next to the refresh button")
+    print("  4. View detailed device capabilities")
+    print(SEP_EQ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import pytest
+
+from qtcast.devices import get_device
+
+
+@pytest.mark.parametrize(
+    "manufacturer,model_name,h265,ac3",
+    [
+        ("Google", "Google TV Streamer", True, True),
+        ("Google Inc.", "Chromecast", False, False),
+        ("Google Inc.", "Chromecast Ultra", True, True),
+        ("Unknown manufacturer", "Google Home Mini", False, False),
+        ("Sony", "BRAVIA", True, True),
+        # Not in the table, so the conservative default is used
+        ("Google", "Chromecast", False, False),
+    ],
+)
+def test_get_device_capabilities(manufacturer, model_name, h265, ac3):
+    device = get_device(manufacturer, model_name)
+    assert device.h265 is h265
+    assert device.ac3 is ac3
+
+
+def test_unknown_device_falls_back_to_default():
+    device = get_device("Acme", "Streambox")
+    assert device.manufacturer == "Unknown manufacturer"
+    assert device.model_name == "Default"
+    assert device.h265 is False
+    assert device.ac3 is False